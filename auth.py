@@ -6,10 +6,13 @@ Simplified Admin Authentication Module
 - 7-day cookie expiry
 """
 
+import hmac
+import random
+import time
+from functools import lru_cache
 from datetime import datetime, timedelta
 from typing import Optional
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+import jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from pydantic import BaseModel
@@ -25,15 +28,19 @@ load_dotenv()
 SECRET_KEY = os.getenv("SECRET_KEY", "your-super-secret-jwt-key-change-this-in-production")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 1440))
+_DEFAULT_EXP_SECONDS = ACCESS_TOKEN_EXPIRE_MINUTES * 60
 
 # Admin credentials from .env (NO DATABASE LOOKUP)
 ADMIN_EMAIL = os.getenv("ADMIN_EMAIL", "admin@pulsepharma.com").lower()
 ADMIN_PASSWORD = os.getenv("ADMIN_PASSWORD", "SecurePassword@2025")
 
+# Encoded once at import; compare_digest on bytes is constant-time
+_ADMIN_EMAIL_B = ADMIN_EMAIL.encode()
+_ADMIN_PASSWORD_B = ADMIN_PASSWORD.encode()
+
 # ============================================================
 # SECURITY SETUP
 # ============================================================
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
 # ============================================================
@@ -64,26 +71,54 @@ class AdminLoginRequest(BaseModel):
 # AUTHENTICATION FUNCTIONS
 # ============================================================
 def verify_admin_credentials(email: str, password: str) -> bool:
-    """Verify admin email and password against .env credentials"""
-    email_match = email.strip().lower() == ADMIN_EMAIL
-    password_match = password.strip() == ADMIN_PASSWORD
-    return email_match and password_match
+    """Verify admin email and password against .env credentials (constant-time)"""
+    e = email.strip().lower().encode()
+    p = password.strip().encode()
+    # Bitwise & so both comparisons always run
+    return bool(hmac.compare_digest(e, _ADMIN_EMAIL_B) & hmac.compare_digest(p, _ADMIN_PASSWORD_B))
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token"""
     to_encode = data.copy()
-    
+
+    # Integer epoch math avoids datetime.utcnow() (deprecated in 3.12)
+    # and the datetime->epoch conversion inside jose
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = int(time.time()) + int(expires_delta.total_seconds())
     else:
-        expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    
+        expire = int(time.time()) + _DEFAULT_EXP_SECONDS
+
+    # Jitter the expiry so tokens issued together don't all expire (and
+    # re-login) in the same instant
+    expire += random.randint(0, 300)
+
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
+# Tokens explicitly invalidated before their exp (logout). The cache above
+# would otherwise keep serving them until expiry.
+_revoked_tokens: set = set()
+
+
+def revoke_token(token: str) -> None:
+    """Mark a token invalid ahead of its expiry (logout)"""
+    _revoked_tokens.add(token)
+
+
+@lru_cache(maxsize=4096)
+def _decode_cached(token: str) -> tuple:
+    """Verify the token signature once and cache (TokenData, exp) per token.
+
+    Repeat requests with the same bearer token skip the HMAC-SHA256 +
+    JSON parse and only re-check expiry.
+    """
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    return TokenData(email=payload.get("sub"), role=payload.get("role")), int(payload.get("exp", 0))
+
+
 def decode_token(token: str) -> TokenData:
     """Decode and validate JWT token"""
     credentials_exception = HTTPException(
@@ -91,18 +126,23 @@ def decode_token(token: str) -> TokenData:
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    
+
+    if token in _revoked_tokens:
+        raise credentials_exception
+
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        role: str = payload.get("role")
-        
-        if email is None:
+        token_data, exp = _decode_cached(token)
+
+        # Expiry must be re-checked on cache hits
+        if exp and exp < time.time():
             raise credentials_exception
-        
-        return TokenData(email=email, role=role)
-    
-    except JWTError:
+
+        if token_data.email is None:
+            raise credentials_exception
+
+        return token_data
+
+    except jwt.PyJWTError:
         raise credentials_exception
 
 
@@ -0,0 +1,27 @@
+from database import engine
+from sqlalchemy import text
+
+with engine.begin() as conn:
+    for col, ddl in [
+        ("applications_count", "ALTER TABLE jobs ADD COLUMN applications_count INTEGER DEFAULT 0;"),
+        ("top_resume_score", "ALTER TABLE jobs ADD COLUMN top_resume_score FLOAT;"),
+        ("avg_resume_score", "ALTER TABLE jobs ADD COLUMN avg_resume_score FLOAT;"),
+    ]:
+        try:
+            conn.execute(text(ddl))
+            print(f"Added {col} to jobs")
+        except Exception as e:
+            print(e)
+
+    try:
+        conn.execute(text(
+            """
+            UPDATE jobs SET
+                applications_count = COALESCE((SELECT COUNT(*) FROM applications WHERE applications.job_id = jobs.id), 0),
+                top_resume_score = (SELECT MAX(resume_score) FROM applications WHERE applications.job_id = jobs.id),
+                avg_resume_score = (SELECT AVG(resume_score) FROM applications WHERE applications.job_id = jobs.id);
+            """
+        ))
+        print("Backfilled job aggregates")
+    except Exception as e:
+        print(e)
@@ -0,0 +1,56 @@
+# cat_state_cache.py
+
+"""
+In-process cache of live CAT exam state.
+
+The hot exam endpoints rebuild a CATEngine on every call, which used to
+mean re-reading every prior item response row for the session — O(n)
+rows fetched per answered item over a 30-item exam, plus a duplicate
+check query. This cache keeps (theta, SE, administered ids, response
+history) per active session so the engine is reconstructed from memory
+and the DB is only read again after a restart. Answer rows and session
+updates are still written per item, so nothing is lost on a crash.
+
+Entries expire after two hours to bound memory; finished sessions are
+dropped explicitly on completion.
+"""
+
+import time
+
+TTL_SECONDS = 7200
+
+_states = {}
+
+
+def _key(table_name: str, session_id: int):
+    return (table_name, session_id)
+
+
+def get(table_name: str, session_id: int):
+    """Return the cached state dict, or None if absent/expired"""
+    _prune()
+    entry = _states.get(_key(table_name, session_id))
+    if entry is None:
+        return None
+    entry["touched"] = time.monotonic()
+    return entry["state"]
+
+
+def put(table_name: str, session_id: int, state: dict) -> None:
+    """Cache the live state for a session"""
+    _states[_key(table_name, session_id)] = {
+        "state": state,
+        "touched": time.monotonic(),
+    }
+
+
+def drop(table_name: str, session_id: int) -> None:
+    """Forget a session (exam completed or abandoned)"""
+    _states.pop(_key(table_name, session_id), None)
+
+
+def _prune() -> None:
+    cutoff = time.monotonic() - TTL_SECONDS
+    stale = [k for k, v in _states.items() if v["touched"] < cutoff]
+    for k in stale:
+        del _states[k]
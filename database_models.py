@@ -1,677 +1,878 @@
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy import Column, String, Integer, Float, Boolean, Text, TIMESTAMP, ForeignKey, Enum, JSON, DECIMAL, Date
-from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
-import enum
-
-
-Base = declarative_base()
-
-
-# ============================================================
-# ENUMS
-# ============================================================
-
-
-class JobType(str, enum.Enum):
-    full_time = "full-time"
-    part_time = "part-time"
-    contract = "contract"
-    internship = "internship"
-
-
-class JobStatus(str, enum.Enum):
-    open = "open"
-    closed = "closed"
-    draft = "draft"
-
-
-class ApplicationStage(str, enum.Enum):
-    applied = "applied"
-    screening = "screening"
-    aptitude = "aptitude"
-    video_hr = "video_hr"
-    final_interview = "final_interview"
-    offer = "offer"
-    hired = "hired"
-    rejected = "rejected"
-
-
-class ExperienceLevel(str, enum.Enum):
-    fresher = "fresher"
-    one_to_three = "1-3 years"
-    three_to_six = "3-6 years"
-    six_plus = "6+ years"
-
-
-class GenderEnum(str, enum.Enum):
-    male = "male"
-    female = "female"
-    other = "other"
-    prefer_not_to_say = "prefer_not_to_say"
-
-
-class Priority(str, enum.Enum):
-    high = "high"
-    medium = "medium"
-    low = "low"
-
-
-class UserRole(str, enum.Enum):
-    candidate = "candidate"
-    hr = "hr"
-    admin = "admin"
-    recruiter = "recruiter"
-    hiring_manager = "hiring_manager"
-
-
-# ============================================================
-# USER TABLE (Updated for HR access requirements)
-# ============================================================
-
-
-class User(Base):
-    __tablename__ = "users"
-
-    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    username = Column(String(100), unique=True, index=True, nullable=False)
-    email = Column(String(255), unique=True, index=True, nullable=False)
-    full_name = Column(String(255), nullable=False)
-    hashed_password = Column(String(255), nullable=False)
-    role = Column(Enum(UserRole), default=UserRole.candidate, nullable=False)
-    is_active = Column(Boolean, default=True)
-    created_at = Column(TIMESTAMP, server_default=func.now())
-
-    # Additional fields for HR users (full access to application)
-    department = Column(String(100), nullable=True)
-    position = Column(String(100), nullable=True)
-
-    # Relationships
-    applications = relationship("Application", back_populates="candidate", foreign_keys="Application.candidate_id")
-    posted_jobs = relationship("Job", back_populates="posted_by_user", foreign_keys="Job.posted_by")
-    created_video_questions = relationship("VideoQuestion", back_populates="created_by_user", foreign_keys="VideoQuestion.created_by")
-    video_reviews = relationship("VideoResponse", back_populates="hr_reviewer", foreign_keys="VideoResponse.hr_reviewed_by")
-
-
-# ============================================================
-# ENHANCED JOB TABLE (Updated ForeignKey for posted_by)
-# ============================================================
-
-
-class Job(Base):
-    __tablename__ = "jobs"
-
-    # Basic Info
-    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    job_code = Column(String(50), unique=True, index=True, nullable=True)
-    title = Column(String(255), nullable=False)
-    department = Column(String(100), nullable=True)
-    location = Column(String(255), default="Hyderabad, India")
-    type = Column(String(20), default="full-time")
-    experience_level = Column(String(20), nullable=True)
-    num_openings = Column(Integer, default=1)
-
-    # Job Requirements
-    required_skills = Column(JSON, nullable=True)  # ["Python", "React", "SQL"]
-    preferred_skills = Column(JSON, nullable=True)  # ["AWS", "Docker"]
-    education_requirement = Column(String(255), nullable=True)  # "B.Tech / MCA"
-    minimum_academic_score = Column(String(50), nullable=True)  # "60%" or "6.0 CGPA"
-    required_certifications = Column(JSON, nullable=True)  # ["AWS Certified"]
-    tools_technologies = Column(JSON, nullable=True)  # ["Git", "Docker", "AWS"]
-
-    # Job Description
-    description = Column(Text, nullable=True)  # Job summary
-    responsibilities = Column(Text, nullable=True)  # Detailed responsibilities
-    key_deliverables = Column(Text, nullable=True)
-    reporting_to = Column(String(100), nullable=True)
-    keywords = Column(JSON, nullable=True)  # For matching algorithm
-
-    # Compensation & Details
-    salary_min = Column(DECIMAL(10, 2), nullable=True)
-    salary_max = Column(DECIMAL(10, 2), nullable=True)
-    salary_range_text = Column(String(100), nullable=True)  # "₹4-6 LPA"
-    benefits = Column(Text, nullable=True)
-
-    # Posting Details
-    status = Column(String(20), default="open")
-    priority = Column(String(20), default="medium")
-    hiring_manager = Column(String(100), nullable=True)
-    posted_by = Column(Integer, ForeignKey("users.id"), nullable=True)
-    posted_at = Column(TIMESTAMP, server_default=func.now())
-    application_deadline = Column(Date, nullable=True)
-
-    # Relationships
-    applications = relationship("Application", back_populates="job", cascade="all, delete-orphan")
-    job_video_questions = relationship("JobVideoQuestion", back_populates="job", cascade="all, delete-orphan")
-    posted_by_user = relationship("User", back_populates="posted_jobs", foreign_keys=[posted_by])
-
-
-# ============================================================
-# ENHANCED CANDIDATE/APPLICATION TABLE (Updated ForeignKey)
-# ============================================================
-
-
-class Application(Base):
-    __tablename__ = "applications"
-
-    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    job_id = Column(Integer, ForeignKey("jobs.id"), nullable=False)
-    candidate_id = Column(Integer, ForeignKey("users.id"), nullable=True)  # FK to users table
-
-    # A. Personal Information
-    full_name = Column(String(255), nullable=False)
-    email = Column(String(255), nullable=False, index=True)
-    phone_number = Column(String(20), nullable=False)
-    date_of_birth = Column(Date, nullable=True)
-    gender = Column(String(20), nullable=True)
-    linkedin_profile = Column(String(500), nullable=True)
-    portfolio_github = Column(String(500), nullable=True)
-    resume_path = Column(String(500), nullable=True)
-
-    # B. Education Details
-    highest_qualification = Column(String(100), nullable=True)  # B.Tech, B.Sc, MBA
-    specialization = Column(String(255), nullable=True)  # Computer Science
-    university_college = Column(String(255), nullable=True)
-    year_of_graduation = Column(Integer, nullable=True)
-    academic_score = Column(String(50), nullable=True)  # "8.2 CGPA" or "75%"
-
-    # C. Work Experience
-    total_experience = Column(Float, default=0.0)  # In years
-    current_company = Column(String(255), nullable=True)
-    previous_companies = Column(JSON, nullable=True)  # Array of company names
-    current_role = Column(String(255), nullable=True)
-    key_responsibilities = Column(Text, nullable=True)
-    achievements = Column(Text, nullable=True)
-    notice_period = Column(String(50), nullable=True)  # "30 days"
-    current_ctc = Column(DECIMAL(10, 2), nullable=True)
-    expected_ctc = Column(DECIMAL(10, 2), nullable=True)
-
-    # D. Skills & Projects
-    technical_skills = Column(JSON, nullable=True)  # ["Java", "React", "SQL"]
-    soft_skills = Column(JSON, nullable=True)  # ["Communication", "Leadership"]
-    certifications = Column(JSON, nullable=True)  # ["AWS Certified Developer"]
-    projects = Column(JSON, nullable=True)  # Array of project objects
-    project_technologies = Column(JSON, nullable=True)  # ["Node.js", "MySQL"]
-    resume_parsed_skills = Column(JSON, nullable=True)  # Auto-extracted skills
-
-    # E. Other Information
-    employment_type_preference = Column(String(50), nullable=True)  # "Full-time" / "Internship"
-    availability_date = Column(Date, nullable=True)
-    references = Column(Text, nullable=True)
-    additional_comments = Column(Text, nullable=True)
-    cover_letter = Column(Text, nullable=True)
-
-    # Scoring & Matching
-    resume_keywords = Column(JSON, nullable=True)
-    resume_score = Column(DECIMAL(5, 2), nullable=True)  # Overall match score (0-100)
-    skills_match_score = Column(DECIMAL(5, 2), nullable=True)  # 40% weight
-    experience_match_score = Column(DECIMAL(5, 2), nullable=True)  # 25% weight
-    education_match_score = Column(DECIMAL(5, 2), nullable=True)  # 15% weight
-    certification_match_score = Column(DECIMAL(5, 2), nullable=True)  # 10% weight
-    keywords_match_score = Column(DECIMAL(5, 2), nullable=True)  # 10% weight
-
-    # Assessment Stages
-    cat_theta = Column(DECIMAL(5, 2), nullable=True)
-    cat_percentile = Column(DECIMAL(5, 2), nullable=True)
-    cat_completed = Column(Boolean, default=False)
-    video_hr_submitted = Column(Boolean, default=False)
-    current_stage = Column(String(50), default="applied")
-
-    # Timestamps
-    applied_at = Column(TIMESTAMP, server_default=func.now())
-    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
-
-    # CAT Exam fields
-    cat_exam_key = Column(String(50), nullable=True)
-    cat_exam_email_sent = Column(Boolean, default=False)
-    cat_exam_email_sent_at = Column(TIMESTAMP, nullable=True)
-
-    # HR Video Interview fields
-    hr_video_exam_key = Column(String(50), nullable=True)
-    hr_video_exam_email_sent = Column(Boolean, default=False)
-    hr_video_exam_email_sent_at = Column(TIMESTAMP, nullable=True)
-    hr_exam_completed = Column(Boolean, default=False)
-
-    # Assignment (3-Section) Exam fields
-    assignment_exam_key = Column(String(50), nullable=True)
-    assignment_exam_email_sent = Column(Boolean, default=False)
-    assignment_exam_email_sent_at = Column(TIMESTAMP, nullable=True)
-    section1_completed = Column(Boolean, default=False)
-    section2_completed = Column(Boolean, default=False)
-    section3_completed = Column(Boolean, default=False)
-    section1_theta = Column(Float, nullable=True)
-    section1_percentile = Column(Float, nullable=True)
-    section2_theta = Column(Float, nullable=True)
-    section2_percentile = Column(Float, nullable=True)
-    section3_theta = Column(Float, nullable=True)
-    section3_percentile = Column(Float, nullable=True)
-    assignment_completed = Column(Boolean, default=False)
-
-    # Relationships
-    job = relationship("Job", back_populates="applications")
-    candidate = relationship("User", back_populates="applications", foreign_keys=[candidate_id])
-    video_responses = relationship("VideoResponse", back_populates="application", cascade="all, delete-orphan")
-    cat_sessions = relationship("CATSession", back_populates="application", cascade="all, delete-orphan")
-    section1_sessions = relationship("Section1Session", back_populates="application", cascade="all, delete-orphan")
-    section2_sessions = relationship("Section2Session", back_populates="application", cascade="all, delete-orphan")
-    section3_sessions = relationship("Section3Session", back_populates="application", cascade="all, delete-orphan")
-
-
-# ============================================================
-# CAT ITEM TABLE
-# ============================================================
-
-
-class CATItem(Base):
-    __tablename__ = "cat_items"
-
-    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    question = Column(Text, nullable=False)
-    option_a = Column(Text, nullable=True)
-    option_b = Column(Text, nullable=True)
-    option_c = Column(Text, nullable=True)
-    option_d = Column(Text, nullable=True)
-    correct = Column(String(1), nullable=False)  # A, B, C, or D
-    a = Column(Float, default=1.0)
-    b = Column(Float, default=0.0)
-    c = Column(Float, default=0.25)
-    used_count = Column(Integer, default=0)
-    correct_count = Column(Integer, default=0)
-    created_at = Column(TIMESTAMP, server_default=func.now())
-
-    # Relationships
-    responses = relationship("CATItemResponse", back_populates="item", cascade="all, delete-orphan")
-
-
-# ============================================================
-# VIDEO QUESTION TABLE
-# ============================================================
-
-
-class VideoQuestion(Base):
-    __tablename__ = "video_questions"
-
-    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    question_text = Column(Text, nullable=False)
-    duration_seconds = Column(Integer, default=120)
-    created_by = Column(Integer, ForeignKey("users.id"), nullable=False)
-    created_at = Column(TIMESTAMP, server_default=func.now())
-    is_active = Column(Boolean, default=True)
-
-    # Relationships
-    job_video_questions = relationship("JobVideoQuestion", back_populates="video_question", cascade="all, delete-orphan")
-    created_by_user = relationship("User", back_populates="created_video_questions", foreign_keys=[created_by])
-
-
-# ============================================================
-# JOB VIDEO QUESTION JUNCTION TABLE
-# ============================================================
-
-
-class JobVideoQuestion(Base):
-    __tablename__ = "job_video_questions"
-
-    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    job_id = Column(Integer, ForeignKey("jobs.id"), nullable=False)
-    video_question_id = Column(Integer, ForeignKey("video_questions.id"), nullable=False)
-    display_order = Column(Integer, default=0)
-
-    # Relationships
-    job = relationship("Job", back_populates="job_video_questions")
-    video_question = relationship("VideoQuestion", back_populates="job_video_questions")
-    video_responses = relationship("VideoResponse", back_populates="job_video_question", cascade="all, delete-orphan")
-
-
-# ============================================================
-# VIDEO RESPONSE TABLE - UPDATED WITH AI SCORING
-# ============================================================
-
-
-class VideoResponse(Base):
-    __tablename__ = "video_responses"
-
-    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    application_id = Column(Integer, ForeignKey("applications.id"), nullable=False)
-    job_video_question_id = Column(Integer, ForeignKey("job_video_questions.id"), nullable=False)
-
-    # Video Details
-    video_path = Column(String(500), nullable=False)
-    duration_seconds = Column(Integer, nullable=True)
-
-    # Question & User Response
-    question_text = Column(Text, nullable=True)  # Store question for context
-    user_answer_text = Column(Text, nullable=True)  # Transcription of user's response
-
-    # AI Scoring (Automatic)
-    ai_score = Column(DECIMAL(5, 2), nullable=True)  # 0-10 scale
-    ai_feedback = Column(Text, nullable=True)  # Detailed AI feedback
-    ai_evaluated_at = Column(TIMESTAMP, nullable=True)
-    ai_evaluated = Column(Boolean, default=False)
-
-    # HR/Admin Final Scoring (Manual Override)
-    hr_score = Column(DECIMAL(5, 2), nullable=True)  # 0-10 scale
-    hr_feedback = Column(Text, nullable=True)  # HR comments
-    hr_reviewed_by = Column(Integer, ForeignKey("users.id"), nullable=True)  # Admin/HR user ID
-    hr_reviewed_at = Column(TIMESTAMP, nullable=True)
-    hr_reviewed = Column(Boolean, default=False)
-
-    # Final Score (Determined by HR or AI if not reviewed)
-    final_score = Column(DECIMAL(5, 2), nullable=True)  # 0-10 scale
-
-    # Status Tracking
-    submitted_at = Column(TIMESTAMP, server_default=func.now())
-    reviewed = Column(Boolean, default=False)  # Keep for backward compatibility
-
-    # Relationships
-    application = relationship("Application", back_populates="video_responses")
-    job_video_question = relationship("JobVideoQuestion", back_populates="video_responses")
-    hr_reviewer = relationship("User", back_populates="video_reviews", foreign_keys=[hr_reviewed_by])
-
-
-# ============================================================
-# CAT SESSION TABLE
-# ============================================================
-
-
-class CATSession(Base):
-    __tablename__ = "cat_sessions"
-
-    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    application_id = Column(Integer, ForeignKey("applications.id"), nullable=False)
-
-    # Session Timing
-    started_at = Column(TIMESTAMP, server_default=func.now())
-    completed_at = Column(TIMESTAMP, nullable=True)
-
-    # Current State During Test
-    current_theta = Column(Float, default=0.0)
-    current_se = Column(Float, nullable=True)
-    num_items_administered = Column(Integer, default=0)
-    is_active = Column(Boolean, default=True)
-
-    # Final Results
-    final_theta = Column(Float, nullable=True)
-    final_se = Column(Float, nullable=True)
-    final_percentile = Column(Float, nullable=True)
-    num_correct = Column(Integer, nullable=True)
-    accuracy = Column(Float, nullable=True)
-
-    # Relationships
-    application = relationship("Application", back_populates="cat_sessions")
-    responses = relationship("CATItemResponse", back_populates="session", cascade="all, delete-orphan")
-
-
-# ============================================================
-# CAT ITEM RESPONSE TABLE
-# ============================================================
-
-
-class CATItemResponse(Base):
-    __tablename__ = "cat_item_responses"
-
-    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    session_id = Column(Integer, ForeignKey("cat_sessions.id"), nullable=False)
-    item_id = Column(Integer, ForeignKey("cat_items.id"), nullable=False)
-
-    # Response Details
-    selected_option = Column(String(1), nullable=False)  # A, B, C, or D
-    is_correct = Column(Boolean, nullable=False)
-    response_time_seconds = Column(Integer, nullable=True)
-
-    # Theta Updates
-    theta_before = Column(Float, nullable=False)
-    theta_after = Column(Float, nullable=False)
-    se_after = Column(Float, nullable=False)
-
-    # Timestamp
-    responded_at = Column(TIMESTAMP, server_default=func.now())
-
-    # Relationships
-    session = relationship("CATSession", back_populates="responses")
-    item = relationship("CATItem", back_populates="responses")
-
-
-# ============================================================
-# HR VIDEO SESSION TABLE (Similar to CAT)
-# ============================================================
-
-
-class HRVideoSession(Base):
-    __tablename__ = "hr_video_sessions"
-
-    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    application_id = Column(Integer, ForeignKey("applications.id"), nullable=True)
-
-    # Session Timing
-    started_at = Column(TIMESTAMP, server_default=func.now())
-    completed_at = Column(TIMESTAMP, nullable=True)
-
-    # Session State
-    is_active = Column(Boolean, default=True)
-    total_questions = Column(Integer, nullable=True)
-    questions_answered = Column(Integer, default=0)
-
-    # Results Summary
-    average_ai_score = Column(Float, nullable=True)
-    min_score = Column(Float, nullable=True)
-    max_score = Column(Float, nullable=True)
-    pending_hr_review = Column(Integer, default=0)
-
-    # Relationships
-    # HR Video responses are directly linked via VideoResponse.application_id
-
-
-# ============================================================
-# AUDIT LOG TABLE (Optional - for tracking changes)
-# ============================================================
-
-
-class AuditLog(Base):
-    __tablename__ = "audit_logs"
-
-    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
-    action = Column(String(255), nullable=False)  # "created_application", "submitted_video", etc.
-    entity_type = Column(String(100), nullable=False)  # "Application", "VideoResponse", "CATSession"
-    entity_id = Column(Integer, nullable=False)
-    old_values = Column(JSON, nullable=True)  # Previous values
-    new_values = Column(JSON, nullable=True)  # New values
-    created_at = Column(TIMESTAMP, server_default=func.now())
-
-
-# ============================================================
-# SECTION 1 ITEM TABLE
-# ============================================================
-
-
-class Section1Item(Base):
-    __tablename__ = "section1_items"
-
-    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    question = Column(Text, nullable=False)
-    option_a = Column(Text, nullable=True)
-    option_b = Column(Text, nullable=True)
-    option_c = Column(Text, nullable=True)
-    option_d = Column(Text, nullable=True)
-    correct = Column(String(1), nullable=False)
-    a = Column(Float, default=1.0)
-    b = Column(Float, default=0.0)
-    c = Column(Float, default=0.25)
-    used_count = Column(Integer, default=0)
-    correct_count = Column(Integer, default=0)
-    created_at = Column(TIMESTAMP, server_default=func.now())
-
-    responses = relationship("Section1Response", back_populates="item", cascade="all, delete-orphan")
-
-
-class Section1Session(Base):
-    __tablename__ = "section1_sessions"
-
-    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    application_id = Column(Integer, ForeignKey("applications.id"), nullable=False)
-    started_at = Column(TIMESTAMP, server_default=func.now())
-    completed_at = Column(TIMESTAMP, nullable=True)
-    current_theta = Column(Float, default=0.0)
-    current_se = Column(Float, nullable=True)
-    num_items_administered = Column(Integer, default=0)
-    is_active = Column(Boolean, default=True)
-    final_theta = Column(Float, nullable=True)
-    final_se = Column(Float, nullable=True)
-    final_percentile = Column(Float, nullable=True)
-    num_correct = Column(Integer, nullable=True)
-    accuracy = Column(Float, nullable=True)
-    face_violations = Column(Integer, default=0)
-    tab_violations = Column(Integer, default=0)
-
-    application = relationship("Application", back_populates="section1_sessions")
-    responses = relationship("Section1Response", back_populates="session", cascade="all, delete-orphan")
-
-
-class Section1Response(Base):
-    __tablename__ = "section1_responses"
-
-    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    session_id = Column(Integer, ForeignKey("section1_sessions.id"), nullable=False)
-    item_id = Column(Integer, ForeignKey("section1_items.id"), nullable=False)
-    selected_option = Column(String(1), nullable=False)
-    is_correct = Column(Boolean, nullable=False)
-    response_time_seconds = Column(Integer, nullable=True)
-    theta_before = Column(Float, nullable=False)
-    theta_after = Column(Float, nullable=False)
-    se_after = Column(Float, nullable=False)
-    responded_at = Column(TIMESTAMP, server_default=func.now())
-
-    session = relationship("Section1Session", back_populates="responses")
-    item = relationship("Section1Item", back_populates="responses")
-
-
-# ============================================================
-# SECTION 2 ITEM TABLE
-# ============================================================
-
-
-class Section2Item(Base):
-    __tablename__ = "section2_items"
-
-    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    question = Column(Text, nullable=False)
-    option_a = Column(Text, nullable=True)
-    option_b = Column(Text, nullable=True)
-    option_c = Column(Text, nullable=True)
-    option_d = Column(Text, nullable=True)
-    correct = Column(String(1), nullable=False)
-    a = Column(Float, default=1.0)
-    b = Column(Float, default=0.0)
-    c = Column(Float, default=0.25)
-    used_count = Column(Integer, default=0)
-    correct_count = Column(Integer, default=0)
-    created_at = Column(TIMESTAMP, server_default=func.now())
-
-    responses = relationship("Section2Response", back_populates="item", cascade="all, delete-orphan")
-
-
-class Section2Session(Base):
-    __tablename__ = "section2_sessions"
-
-    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    application_id = Column(Integer, ForeignKey("applications.id"), nullable=False)
-    started_at = Column(TIMESTAMP, server_default=func.now())
-    completed_at = Column(TIMESTAMP, nullable=True)
-    current_theta = Column(Float, default=0.0)
-    current_se = Column(Float, nullable=True)
-    num_items_administered = Column(Integer, default=0)
-    is_active = Column(Boolean, default=True)
-    final_theta = Column(Float, nullable=True)
-    final_se = Column(Float, nullable=True)
-    final_percentile = Column(Float, nullable=True)
-    num_correct = Column(Integer, nullable=True)
-    accuracy = Column(Float, nullable=True)
-    face_violations = Column(Integer, default=0)
-    tab_violations = Column(Integer, default=0)
-
-    application = relationship("Application", back_populates="section2_sessions")
-    responses = relationship("Section2Response", back_populates="session", cascade="all, delete-orphan")
-
-
-class Section2Response(Base):
-    __tablename__ = "section2_responses"
-
-    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    session_id = Column(Integer, ForeignKey("section2_sessions.id"), nullable=False)
-    item_id = Column(Integer, ForeignKey("section2_items.id"), nullable=False)
-    selected_option = Column(String(1), nullable=False)
-    is_correct = Column(Boolean, nullable=False)
-    response_time_seconds = Column(Integer, nullable=True)
-    theta_before = Column(Float, nullable=False)
-    theta_after = Column(Float, nullable=False)
-    se_after = Column(Float, nullable=False)
-    responded_at = Column(TIMESTAMP, server_default=func.now())
-
-    session = relationship("Section2Session", back_populates="responses")
-    item = relationship("Section2Item", back_populates="responses")
-
-
-# ============================================================
-# SECTION 3 ITEM TABLE
-# ============================================================
-
-
-class Section3Item(Base):
-    __tablename__ = "section3_items"
-
-    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    question = Column(Text, nullable=False)
-    option_a = Column(Text, nullable=True)
-    option_b = Column(Text, nullable=True)
-    option_c = Column(Text, nullable=True)
-    option_d = Column(Text, nullable=True)
-    correct = Column(String(1), nullable=False)
-    a = Column(Float, default=1.0)
-    b = Column(Float, default=0.0)
-    c = Column(Float, default=0.25)
-    used_count = Column(Integer, default=0)
-    correct_count = Column(Integer, default=0)
-    created_at = Column(TIMESTAMP, server_default=func.now())
-
-    responses = relationship("Section3Response", back_populates="item", cascade="all, delete-orphan")
-
-
-class Section3Session(Base):
-    __tablename__ = "section3_sessions"
-
-    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    application_id = Column(Integer, ForeignKey("applications.id"), nullable=False)
-    started_at = Column(TIMESTAMP, server_default=func.now())
-    completed_at = Column(TIMESTAMP, nullable=True)
-    current_theta = Column(Float, default=0.0)
-    current_se = Column(Float, nullable=True)
-    num_items_administered = Column(Integer, default=0)
-    is_active = Column(Boolean, default=True)
-    final_theta = Column(Float, nullable=True)
-    final_se = Column(Float, nullable=True)
-    final_percentile = Column(Float, nullable=True)
-    num_correct = Column(Integer, nullable=True)
-    accuracy = Column(Float, nullable=True)
-    face_violations = Column(Integer, default=0)
-    tab_violations = Column(Integer, default=0)
-
-    application = relationship("Application", back_populates="section3_sessions")
-    responses = relationship("Section3Response", back_populates="session", cascade="all, delete-orphan")
-
-
-class Section3Response(Base):
-    __tablename__ = "section3_responses"
-
-    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    session_id = Column(Integer, ForeignKey("section3_sessions.id"), nullable=False)
-    item_id = Column(Integer, ForeignKey("section3_items.id"), nullable=False)
-    selected_option = Column(String(1), nullable=False)
-    is_correct = Column(Boolean, nullable=False)
-    response_time_seconds = Column(Integer, nullable=True)
-    theta_before = Column(Float, nullable=False)
-    theta_after = Column(Float, nullable=False)
-    se_after = Column(Float, nullable=False)
-    responded_at = Column(TIMESTAMP, server_default=func.now())
-
-    session = relationship("Section3Session", back_populates="responses")
-    item = relationship("Section3Item", back_populates="responses")
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy import Column, String, Integer, Float, Boolean, Text, TIMESTAMP, ForeignKey, Enum, JSON, DECIMAL, Date, Index, text, event, select, LargeBinary, TypeDecorator, UniqueConstraint, CheckConstraint
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import JSONB
+import enum
+import zlib
+
+
+Base = declarative_base()
+
+# On Postgres the skill/project arrays are stored as JSONB so containment
+# filters (technical_skills @> '["Python"]') can use a GIN index instead of
+# reparsing text JSON per row. Other dialects (sqlite in dev) keep plain JSON.
+JSONList = JSON().with_variant(JSONB(), "postgresql")
+
+
+class CompressedText(TypeDecorator):
+    """
+    Transparent zlib compression for large free-text columns (cover
+    letters, AI feedback, ...). Multi-KB strings compress ~4x, so rows
+    shrink and listing queries fit more tuples per page. Reads that hit
+    legacy uncompressed rows fall back to the raw text.
+    """
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return zlib.compress(value.encode("utf-8"), 6)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        if isinstance(value, str):  # legacy row stored before compression
+            return value
+        try:
+            return zlib.decompress(value).decode("utf-8")
+        except zlib.error:
+            return bytes(value).decode("utf-8", errors="replace")
+
+
+# ============================================================
+# ENUMS
+# ============================================================
+
+
+class JobType(str, enum.Enum):
+    full_time = "full-time"
+    part_time = "part-time"
+    contract = "contract"
+    internship = "internship"
+
+
+class JobStatus(str, enum.Enum):
+    open = "open"
+    closed = "closed"
+    draft = "draft"
+
+
+class ApplicationStage(str, enum.Enum):
+    applied = "applied"
+    screening = "screening"
+    aptitude = "aptitude"
+    video_hr = "video_hr"
+    final_interview = "final_interview"
+    offer = "offer"
+    hired = "hired"
+    rejected = "rejected"
+
+
+class ExperienceLevel(str, enum.Enum):
+    fresher = "fresher"
+    one_to_three = "1-3 years"
+    three_to_six = "3-6 years"
+    six_plus = "6+ years"
+
+
+class GenderEnum(str, enum.Enum):
+    male = "male"
+    female = "female"
+    other = "other"
+    prefer_not_to_say = "prefer_not_to_say"
+
+
+class Priority(str, enum.Enum):
+    high = "high"
+    medium = "medium"
+    low = "low"
+
+
+class UserRole(str, enum.Enum):
+    candidate = "candidate"
+    hr = "hr"
+    admin = "admin"
+    recruiter = "recruiter"
+    hiring_manager = "hiring_manager"
+
+
+# ============================================================
+# USER TABLE (Updated for HR access requirements)
+# ============================================================
+
+
+class User(Base):
+    __tablename__ = "users"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    username = Column(String(100), unique=True, index=True, nullable=False)
+    email = Column(String(255), unique=True, index=True, nullable=False)
+    full_name = Column(String(255), nullable=False)
+    hashed_password = Column(String(255), nullable=False)
+    role = Column(Enum(UserRole), default=UserRole.candidate, nullable=False)
+    is_active = Column(Boolean, default=True)
+    created_at = Column(TIMESTAMP, server_default=func.now())
+
+    # Additional fields for HR users (full access to application)
+    department = Column(String(100), nullable=True)
+    position = Column(String(100), nullable=True)
+
+    # Relationships
+    applications = relationship("Application", back_populates="candidate", foreign_keys="Application.candidate_id")
+    posted_jobs = relationship("Job", back_populates="posted_by_user", foreign_keys="Job.posted_by")
+    created_video_questions = relationship("VideoQuestion", back_populates="created_by_user", foreign_keys="VideoQuestion.created_by")
+    video_reviews = relationship("VideoResponse", back_populates="hr_reviewer", foreign_keys="VideoResponse.hr_reviewed_by")
+
+
+# ============================================================
+# ENHANCED JOB TABLE (Updated ForeignKey for posted_by)
+# ============================================================
+
+
+class Job(Base):
+    __tablename__ = "jobs"
+
+    # Basic Info
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    job_code = Column(String(50), unique=True, index=True, nullable=True)
+    title = Column(String(255), nullable=False)
+    department = Column(String(100), nullable=True)
+    location = Column(String(255), default="Hyderabad, India")
+    type = Column(String(20), default="full-time")
+    experience_level = Column(String(20), nullable=True)
+    num_openings = Column(Integer, default=1)
+
+    # Job Requirements
+    required_skills = Column(JSON, nullable=True)  # ["Python", "React", "SQL"]
+    preferred_skills = Column(JSON, nullable=True)  # ["AWS", "Docker"]
+    education_requirement = Column(String(255), nullable=True)  # "B.Tech / MCA"
+    minimum_academic_score = Column(String(50), nullable=True)  # "60%" or "6.0 CGPA"
+    required_certifications = Column(JSON, nullable=True)  # ["AWS Certified"]
+    tools_technologies = Column(JSON, nullable=True)  # ["Git", "Docker", "AWS"]
+
+    # Job Description
+    description = Column(Text, nullable=True)  # Job summary
+    responsibilities = Column(Text, nullable=True)  # Detailed responsibilities
+    key_deliverables = Column(Text, nullable=True)
+    reporting_to = Column(String(100), nullable=True)
+    keywords = Column(JSON, nullable=True)  # For matching algorithm
+
+    # Compensation & Details
+    salary_min = Column(DECIMAL(10, 2), nullable=True)
+    salary_max = Column(DECIMAL(10, 2), nullable=True)
+    salary_range_text = Column(String(100), nullable=True)  # "₹4-6 LPA"
+    benefits = Column(Text, nullable=True)
+
+    # Posting Details
+    status = Column(String(20), default="open")
+    priority = Column(String(20), default="medium")
+    hiring_manager = Column(String(100), nullable=True)
+    posted_by = Column(Integer, ForeignKey("users.id"), nullable=True)
+    posted_at = Column(TIMESTAMP, server_default=func.now())
+    application_deadline = Column(Date, nullable=True)
+
+    # Denormalized applicant aggregates, maintained by the Application
+    # event listeners below so listings read one row per job instead of
+    # aggregating the applications table on every request
+    applications_count = Column(Integer, default=0)
+    top_resume_score = Column(Float, nullable=True)
+    avg_resume_score = Column(Float, nullable=True)
+
+    # Relationships
+    applications = relationship("Application", back_populates="job", cascade="all, delete-orphan")
+    job_video_questions = relationship("JobVideoQuestion", back_populates="job", cascade="all, delete-orphan")
+    posted_by_user = relationship("User", back_populates="posted_jobs", foreign_keys=[posted_by])
+
+    # Job-board listing filters by status and orders newest-first
+    __table_args__ = (
+        Index("ix_job_status_posted", "status", text("posted_at DESC")),
+    )
+
+
+# ============================================================
+# ENHANCED CANDIDATE/APPLICATION TABLE (Updated ForeignKey)
+# ============================================================
+
+
+class Application(Base):
+    __tablename__ = "applications"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    job_id = Column(Integer, ForeignKey("jobs.id"), nullable=False)
+    candidate_id = Column(Integer, ForeignKey("users.id"), nullable=True)  # FK to users table
+
+    # A. Personal Information
+    full_name = Column(String(255), nullable=False)
+    email = Column(String(255), nullable=False, index=True)
+    phone_number = Column(String(20), nullable=False)
+    date_of_birth = Column(Date, nullable=True)
+    gender = Column(String(20), nullable=True)
+    linkedin_profile = Column(String(500), nullable=True)
+    portfolio_github = Column(String(500), nullable=True)
+    resume_path = Column(String(500), nullable=True)
+
+    # B. Education Details
+    highest_qualification = Column(String(100), nullable=True)  # B.Tech, B.Sc, MBA
+    specialization = Column(String(255), nullable=True)  # Computer Science
+    university_college = Column(String(255), nullable=True)
+    year_of_graduation = Column(Integer, nullable=True)
+    academic_score = Column(String(50), nullable=True)  # "8.2 CGPA" or "75%"
+
+    # C. Work Experience
+    total_experience = Column(Float, default=0.0)  # In years
+    current_company = Column(String(255), nullable=True)
+    previous_companies = Column(JSONList, nullable=True)  # Array of company names
+    current_role = Column(String(255), nullable=True)
+    key_responsibilities = Column(CompressedText, nullable=True)
+    achievements = Column(CompressedText, nullable=True)
+    notice_period = Column(String(50), nullable=True)  # "30 days"
+    current_ctc = Column(DECIMAL(10, 2), nullable=True)
+    expected_ctc = Column(DECIMAL(10, 2), nullable=True)
+
+    # D. Skills & Projects
+    technical_skills = Column(JSONList, nullable=True)  # ["Java", "React", "SQL"]
+    soft_skills = Column(JSONList, nullable=True)  # ["Communication", "Leadership"]
+    certifications = Column(JSONList, nullable=True)  # ["AWS Certified Developer"]
+    projects = Column(JSONList, nullable=True)  # Array of project objects
+    project_technologies = Column(JSONList, nullable=True)  # ["Node.js", "MySQL"]
+    resume_parsed_skills = Column(JSONList, nullable=True)  # Auto-extracted skills
+
+    # E. Other Information
+    employment_type_preference = Column(String(50), nullable=True)  # "Full-time" / "Internship"
+    availability_date = Column(Date, nullable=True)
+    references = Column(Text, nullable=True)
+    additional_comments = Column(Text, nullable=True)
+    cover_letter = Column(CompressedText, nullable=True)
+
+    # Scoring & Matching
+    resume_keywords = Column(JSONList, nullable=True)
+    resume_score = Column(DECIMAL(5, 2), nullable=True)  # Overall match score (0-100)
+    skills_match_score = Column(DECIMAL(5, 2), nullable=True)  # 40% weight
+    experience_match_score = Column(DECIMAL(5, 2), nullable=True)  # 25% weight
+    education_match_score = Column(DECIMAL(5, 2), nullable=True)  # 15% weight
+    certification_match_score = Column(DECIMAL(5, 2), nullable=True)  # 10% weight
+    keywords_match_score = Column(DECIMAL(5, 2), nullable=True)  # 10% weight
+
+    # Assessment Stages
+    cat_theta = Column(DECIMAL(5, 2), nullable=True)
+    cat_percentile = Column(DECIMAL(5, 2), nullable=True)
+    cat_completed = Column(Boolean, default=False)
+    video_hr_submitted = Column(Boolean, default=False)
+    current_stage = Column(String(50), default="applied")
+
+    # Timestamps
+    applied_at = Column(TIMESTAMP, server_default=func.now())
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
+
+    # CAT Exam fields
+    cat_exam_key = Column(String(50), unique=True, nullable=True)
+    cat_exam_email_sent = Column(Boolean, default=False)
+    cat_exam_email_sent_at = Column(TIMESTAMP, nullable=True)
+
+    # HR Video Interview fields
+    hr_video_exam_key = Column(String(50), nullable=True)
+    hr_video_exam_email_sent = Column(Boolean, default=False)
+    hr_video_exam_email_sent_at = Column(TIMESTAMP, nullable=True)
+    hr_exam_completed = Column(Boolean, default=False)
+
+    # Assignment (3-Section) Exam fields
+    assignment_exam_key = Column(String(50), nullable=True)
+    assignment_exam_email_sent = Column(Boolean, default=False)
+    assignment_exam_email_sent_at = Column(TIMESTAMP, nullable=True)
+    section1_completed = Column(Boolean, default=False)
+    section2_completed = Column(Boolean, default=False)
+    section3_completed = Column(Boolean, default=False)
+    section1_theta = Column(Float, nullable=True)
+    section1_percentile = Column(Float, nullable=True)
+    section2_theta = Column(Float, nullable=True)
+    section2_percentile = Column(Float, nullable=True)
+    section3_theta = Column(Float, nullable=True)
+    section3_percentile = Column(Float, nullable=True)
+    assignment_completed = Column(Boolean, default=False)
+
+    # Relationships
+    job = relationship("Job", back_populates="applications")
+    candidate = relationship("User", back_populates="applications", foreign_keys=[candidate_id])
+    video_responses = relationship("VideoResponse", back_populates="application", cascade="all, delete-orphan")
+    cat_sessions = relationship("CATSession", back_populates="application", cascade="all, delete-orphan")
+    section1_sessions = relationship("Section1Session", back_populates="application", cascade="all, delete-orphan")
+    section2_sessions = relationship("Section2Session", back_populates="application", cascade="all, delete-orphan")
+    section3_sessions = relationship("Section3Session", back_populates="application", cascade="all, delete-orphan")
+    skills = relationship("ApplicationSkill", back_populates="application", cascade="all, delete-orphan")
+
+    # Composite indexes matching the dashboard's filter/sort patterns:
+    # per-job stage listings ordered by score, and a candidate's
+    # application history newest-first
+    __table_args__ = (
+        Index("ix_app_job_stage_score", "job_id", "current_stage", text("resume_score DESC")),
+        Index("ix_app_candidate_time", "candidate_id", text("applied_at DESC")),
+        # Dashboard recency counters range-scan on applied_at alone
+        Index("ix_app_applied_at", "applied_at"),
+        # Pending-exam queues only touch these two stages (PostgreSQL only)
+        Index(
+            "ix_app_stage_pending",
+            "current_stage",
+            postgresql_where=text("current_stage IN ('aptitude', 'video_hr')"),
+        ),
+        # GIN index so candidate-skill containment filters
+        # (technical_skills @> '["Python"]') are index lookups (PostgreSQL only)
+        Index("ix_app_tskills_gin", "technical_skills", postgresql_using="gin"),
+        # /exam/validate looks up by video key; cat_exam_key is already
+        # unique-indexed. Partial on PostgreSQL so the mostly-NULL column
+        # doesn't bloat the index
+        Index(
+            "ix_app_hr_key",
+            "hr_video_exam_key",
+            unique=True,
+            postgresql_where=text("hr_video_exam_key IS NOT NULL"),
+        ),
+    )
+
+
+# ============================================================
+# NORMALIZED SKILL TABLES
+# ============================================================
+# The JSON skill arrays on Application stay as a denormalized cache for
+# serialization; these tables give skill search an indexed join instead
+# of parsing every application's JSON in Python.
+
+
+class Skill(Base):
+    __tablename__ = "skills"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    name = Column(String(100), unique=True, index=True, nullable=False)  # lowercased
+
+    application_skills = relationship("ApplicationSkill", back_populates="skill", cascade="all, delete-orphan")
+
+
+class ApplicationSkill(Base):
+    __tablename__ = "application_skills"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    application_id = Column(Integer, ForeignKey("applications.id", ondelete="CASCADE"), nullable=False)
+    skill_id = Column(Integer, ForeignKey("skills.id"), nullable=False)
+    weight = Column(Float, default=1.0)  # base + log1p(experience) + cert bonus
+    source = Column(String(20), nullable=True)  # "form" / "resume" / "certification"
+
+    application = relationship("Application", back_populates="skills")
+    skill = relationship("Skill", back_populates="application_skills")
+
+    __table_args__ = (
+        Index("ix_appskill_skill_weight", "skill_id", "weight"),
+        Index("ix_appskill_application", "application_id"),
+    )
+
+
+# ============================================================
+# CAT ITEM TABLE
+# ============================================================
+
+
+class CATItem(Base):
+    __tablename__ = "cat_items"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    question = Column(Text, nullable=False)
+    option_a = Column(Text, nullable=True)
+    option_b = Column(Text, nullable=True)
+    option_c = Column(Text, nullable=True)
+    option_d = Column(Text, nullable=True)
+    correct = Column(String(1), nullable=False)  # A, B, C, or D
+    a = Column(Float, default=1.0)
+    b = Column(Float, default=0.0)
+    c = Column(Float, default=0.25)
+    used_count = Column(Integer, default=0)
+    correct_count = Column(Integer, default=0)
+    created_at = Column(TIMESTAMP, server_default=func.now())
+
+    # Relationships
+    responses = relationship("CATItemResponse", back_populates="item", cascade="all, delete-orphan")
+
+
+# ============================================================
+# VIDEO QUESTION TABLE
+# ============================================================
+
+
+class VideoQuestion(Base):
+    __tablename__ = "video_questions"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    question_text = Column(Text, nullable=False)
+    duration_seconds = Column(Integer, default=120)
+    created_by = Column(Integer, ForeignKey("users.id"), nullable=False)
+    created_at = Column(TIMESTAMP, server_default=func.now())
+    is_active = Column(Boolean, default=True)
+
+    # Relationships
+    job_video_questions = relationship("JobVideoQuestion", back_populates="video_question", cascade="all, delete-orphan")
+    created_by_user = relationship("User", back_populates="created_video_questions", foreign_keys=[created_by])
+
+
+# ============================================================
+# JOB VIDEO QUESTION JUNCTION TABLE
+# ============================================================
+
+
+class JobVideoQuestion(Base):
+    __tablename__ = "job_video_questions"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    job_id = Column(Integer, ForeignKey("jobs.id"), nullable=False)
+    video_question_id = Column(Integer, ForeignKey("video_questions.id"), nullable=False)
+    display_order = Column(Integer, default=0)
+
+    # Relationships
+    job = relationship("Job", back_populates="job_video_questions")
+    video_question = relationship("VideoQuestion", back_populates="job_video_questions")
+    video_responses = relationship("VideoResponse", back_populates="job_video_question", cascade="all, delete-orphan")
+
+    # A question links to a job at most once; the backing unique index
+    # also serves the (job_id, video_question_id) existence lookup
+    __table_args__ = (
+        UniqueConstraint("job_id", "video_question_id", name="uq_job_video_question"),
+    )
+
+
+# ============================================================
+# VIDEO RESPONSE TABLE - UPDATED WITH AI SCORING
+# ============================================================
+
+
+class VideoResponse(Base):
+    __tablename__ = "video_responses"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    application_id = Column(Integer, ForeignKey("applications.id"), nullable=False)
+    job_video_question_id = Column(Integer, ForeignKey("job_video_questions.id"), nullable=False)
+
+    # Video Details
+    video_path = Column(String(500), nullable=False)
+    duration_seconds = Column(Integer, nullable=True)
+
+    # Question & User Response
+    question_text = Column(Text, nullable=True)  # Store question for context
+    user_answer_text = Column(Text, nullable=True)  # Transcription of user's response
+
+    # AI Scoring (Automatic)
+    ai_score = Column(DECIMAL(5, 2), nullable=True)  # 0-10 scale
+    ai_feedback = Column(CompressedText, nullable=True)  # Detailed AI feedback
+    ai_evaluated_at = Column(TIMESTAMP, nullable=True)
+    ai_evaluated = Column(Boolean, default=False)
+
+    # HR/Admin Final Scoring (Manual Override)
+    hr_score = Column(DECIMAL(5, 2), nullable=True)  # 0-10 scale
+    hr_feedback = Column(Text, nullable=True)  # HR comments
+    hr_reviewed_by = Column(Integer, ForeignKey("users.id"), nullable=True)  # Admin/HR user ID
+    hr_reviewed_at = Column(TIMESTAMP, nullable=True)
+    hr_reviewed = Column(Boolean, default=False)
+
+    # Final Score (Determined by HR or AI if not reviewed)
+    final_score = Column(DECIMAL(5, 2), nullable=True)  # 0-10 scale
+
+    # Status Tracking
+    submitted_at = Column(TIMESTAMP, server_default=func.now())
+    reviewed = Column(Boolean, default=False)  # Keep for backward compatibility
+
+    # Relationships
+    application = relationship("Application", back_populates="video_responses")
+    job_video_question = relationship("JobVideoQuestion", back_populates="video_responses")
+    hr_reviewer = relationship("User", back_populates="video_reviews", foreign_keys=[hr_reviewed_by])
+
+    # One lookup path for "this application's answer to this question";
+    # the CHECK keeps scores on the 0-10 scale no matter which code path
+    # writes them
+    __table_args__ = (
+        Index("ix_vr_application_question", "application_id", "job_video_question_id"),
+        CheckConstraint(
+            "hr_score IS NULL OR (hr_score >= 0 AND hr_score <= 10)",
+            name="ck_vr_hr_score_range",
+        ),
+    )
+
+
+# ============================================================
+# CAT SESSION TABLE
+# ============================================================
+
+
+class CATSession(Base):
+    __tablename__ = "cat_sessions"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    application_id = Column(Integer, ForeignKey("applications.id"), nullable=False)
+
+    # Session Timing
+    started_at = Column(TIMESTAMP, server_default=func.now())
+    completed_at = Column(TIMESTAMP, nullable=True)
+
+    # Current State During Test
+    current_theta = Column(Float, default=0.0)
+    current_se = Column(Float, nullable=True)
+    num_items_administered = Column(Integer, default=0)
+    is_active = Column(Boolean, default=True)
+
+    # Final Results
+    final_theta = Column(Float, nullable=True)
+    final_se = Column(Float, nullable=True)
+    final_percentile = Column(Float, nullable=True)
+    num_correct = Column(Integer, nullable=True)
+    accuracy = Column(Float, nullable=True)
+
+    # Relationships
+    application = relationship("Application", back_populates="cat_sessions")
+    responses = relationship("CATItemResponse", back_populates="session", cascade="all, delete-orphan")
+
+    # Partial index so calibration can find finished sessions without a
+    # seq-scan (PostgreSQL only; other backends ignore the WHERE clause)
+    __table_args__ = (
+        Index(
+            "ix_cat_sessions_finished",
+            "id",
+            postgresql_where=(is_active == False),
+        ),
+    )
+
+
+# ============================================================
+# CAT ITEM RESPONSE TABLE
+# ============================================================
+
+
+class CATItemResponse(Base):
+    __tablename__ = "cat_item_responses"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    session_id = Column(Integer, ForeignKey("cat_sessions.id"), nullable=False)
+    item_id = Column(Integer, ForeignKey("cat_items.id"), nullable=False)
+
+    # Response Details
+    selected_option = Column(String(1), nullable=False)  # A, B, C, or D
+    is_correct = Column(Boolean, nullable=False)
+    response_time_seconds = Column(Integer, nullable=True)
+
+    # Theta Updates
+    theta_before = Column(Float, nullable=False)
+    theta_after = Column(Float, nullable=False)
+    se_after = Column(Float, nullable=False)
+
+    # Timestamp
+    responded_at = Column(TIMESTAMP, server_default=func.now())
+
+    # Relationships
+    session = relationship("CATSession", back_populates="responses")
+    item = relationship("CATItem", back_populates="responses")
+
+    # Session rebuilds read a session's responses in answer order; the
+    # covering index serves the dup-check and history rebuild as
+    # index-only scans on Postgres (INCLUDE is ignored elsewhere)
+    __table_args__ = (
+        Index("ix_cir_session_time", "session_id", "responded_at"),
+        Index(
+            "ix_catitemresp_session_item",
+            "session_id",
+            "item_id",
+            postgresql_include=[
+                "selected_option", "is_correct",
+                "theta_before", "theta_after", "se_after",
+            ],
+        ),
+    )
+
+
+# ============================================================
+# HR VIDEO SESSION TABLE (Similar to CAT)
+# ============================================================
+
+
+class HRVideoSession(Base):
+    __tablename__ = "hr_video_sessions"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    application_id = Column(Integer, ForeignKey("applications.id"), nullable=True)
+
+    # Session Timing
+    started_at = Column(TIMESTAMP, server_default=func.now())
+    completed_at = Column(TIMESTAMP, nullable=True)
+
+    # Session State
+    is_active = Column(Boolean, default=True)
+    total_questions = Column(Integer, nullable=True)
+    questions_answered = Column(Integer, default=0)
+
+    # Results Summary
+    average_ai_score = Column(Float, nullable=True)
+    min_score = Column(Float, nullable=True)
+    max_score = Column(Float, nullable=True)
+    pending_hr_review = Column(Integer, default=0)
+
+    # Relationships
+    # HR Video responses are directly linked via VideoResponse.application_id
+
+
+# ============================================================
+# AUDIT LOG TABLE (Optional - for tracking changes)
+# ============================================================
+
+
+class AuditLog(Base):
+    __tablename__ = "audit_logs"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    action = Column(String(255), nullable=False)  # "created_application", "submitted_video", etc.
+    entity_type = Column(String(100), nullable=False)  # "Application", "VideoResponse", "CATSession"
+    entity_id = Column(Integer, nullable=False)
+    old_values = Column(JSON, nullable=True)  # Previous values
+    new_values = Column(JSON, nullable=True)  # New values
+    created_at = Column(TIMESTAMP, server_default=func.now())
+
+
+# ============================================================
+# RESUME SCORING CACHE TABLE
+# ============================================================
+
+
+class ScoringCache(Base):
+    __tablename__ = "scoring_cache"
+
+    # "resume_hash:jd_hash" — see scoring_cache.make_key
+    key = Column(String(33), primary_key=True)
+    payload = Column(JSON, nullable=False)  # The 5 sub-scores + analysis
+    created_at = Column(TIMESTAMP, server_default=func.now())
+
+
+# ============================================================
+# SECTION 1 ITEM TABLE
+# ============================================================
+
+
+class Section1Item(Base):
+    __tablename__ = "section1_items"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    question = Column(Text, nullable=False)
+    option_a = Column(Text, nullable=True)
+    option_b = Column(Text, nullable=True)
+    option_c = Column(Text, nullable=True)
+    option_d = Column(Text, nullable=True)
+    correct = Column(String(1), nullable=False)
+    a = Column(Float, default=1.0)
+    b = Column(Float, default=0.0)
+    c = Column(Float, default=0.25)
+    used_count = Column(Integer, default=0)
+    correct_count = Column(Integer, default=0)
+    created_at = Column(TIMESTAMP, server_default=func.now())
+
+    responses = relationship("Section1Response", back_populates="item", cascade="all, delete-orphan")
+
+
+class Section1Session(Base):
+    __tablename__ = "section1_sessions"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    application_id = Column(Integer, ForeignKey("applications.id"), nullable=False)
+    started_at = Column(TIMESTAMP, server_default=func.now())
+    completed_at = Column(TIMESTAMP, nullable=True)
+    current_theta = Column(Float, default=0.0)
+    current_se = Column(Float, nullable=True)
+    num_items_administered = Column(Integer, default=0)
+    is_active = Column(Boolean, default=True)
+    final_theta = Column(Float, nullable=True)
+    final_se = Column(Float, nullable=True)
+    final_percentile = Column(Float, nullable=True)
+    num_correct = Column(Integer, nullable=True)
+    accuracy = Column(Float, nullable=True)
+    face_violations = Column(Integer, default=0)
+    tab_violations = Column(Integer, default=0)
+
+    application = relationship("Application", back_populates="section1_sessions")
+    responses = relationship("Section1Response", back_populates="session", cascade="all, delete-orphan")
+
+
+class Section1Response(Base):
+    __tablename__ = "section1_responses"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    session_id = Column(Integer, ForeignKey("section1_sessions.id"), nullable=False)
+    item_id = Column(Integer, ForeignKey("section1_items.id"), nullable=False)
+    selected_option = Column(String(1), nullable=False)
+    is_correct = Column(Boolean, nullable=False)
+    response_time_seconds = Column(Integer, nullable=True)
+    theta_before = Column(Float, nullable=False)
+    theta_after = Column(Float, nullable=False)
+    se_after = Column(Float, nullable=False)
+    responded_at = Column(TIMESTAMP, server_default=func.now())
+
+    session = relationship("Section1Session", back_populates="responses")
+    item = relationship("Section1Item", back_populates="responses")
+
+
+# ============================================================
+# SECTION 2 ITEM TABLE
+# ============================================================
+
+
+class Section2Item(Base):
+    __tablename__ = "section2_items"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    question = Column(Text, nullable=False)
+    option_a = Column(Text, nullable=True)
+    option_b = Column(Text, nullable=True)
+    option_c = Column(Text, nullable=True)
+    option_d = Column(Text, nullable=True)
+    correct = Column(String(1), nullable=False)
+    a = Column(Float, default=1.0)
+    b = Column(Float, default=0.0)
+    c = Column(Float, default=0.25)
+    used_count = Column(Integer, default=0)
+    correct_count = Column(Integer, default=0)
+    created_at = Column(TIMESTAMP, server_default=func.now())
+
+    responses = relationship("Section2Response", back_populates="item", cascade="all, delete-orphan")
+
+
+class Section2Session(Base):
+    __tablename__ = "section2_sessions"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    application_id = Column(Integer, ForeignKey("applications.id"), nullable=False)
+    started_at = Column(TIMESTAMP, server_default=func.now())
+    completed_at = Column(TIMESTAMP, nullable=True)
+    current_theta = Column(Float, default=0.0)
+    current_se = Column(Float, nullable=True)
+    num_items_administered = Column(Integer, default=0)
+    is_active = Column(Boolean, default=True)
+    final_theta = Column(Float, nullable=True)
+    final_se = Column(Float, nullable=True)
+    final_percentile = Column(Float, nullable=True)
+    num_correct = Column(Integer, nullable=True)
+    accuracy = Column(Float, nullable=True)
+    face_violations = Column(Integer, default=0)
+    tab_violations = Column(Integer, default=0)
+
+    application = relationship("Application", back_populates="section2_sessions")
+    responses = relationship("Section2Response", back_populates="session", cascade="all, delete-orphan")
+
+
+class Section2Response(Base):
+    __tablename__ = "section2_responses"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    session_id = Column(Integer, ForeignKey("section2_sessions.id"), nullable=False)
+    item_id = Column(Integer, ForeignKey("section2_items.id"), nullable=False)
+    selected_option = Column(String(1), nullable=False)
+    is_correct = Column(Boolean, nullable=False)
+    response_time_seconds = Column(Integer, nullable=True)
+    theta_before = Column(Float, nullable=False)
+    theta_after = Column(Float, nullable=False)
+    se_after = Column(Float, nullable=False)
+    responded_at = Column(TIMESTAMP, server_default=func.now())
+
+    session = relationship("Section2Session", back_populates="responses")
+    item = relationship("Section2Item", back_populates="responses")
+
+
+# ============================================================
+# SECTION 3 ITEM TABLE
+# ============================================================
+
+
+class Section3Item(Base):
+    __tablename__ = "section3_items"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    question = Column(Text, nullable=False)
+    option_a = Column(Text, nullable=True)
+    option_b = Column(Text, nullable=True)
+    option_c = Column(Text, nullable=True)
+    option_d = Column(Text, nullable=True)
+    correct = Column(String(1), nullable=False)
+    a = Column(Float, default=1.0)
+    b = Column(Float, default=0.0)
+    c = Column(Float, default=0.25)
+    used_count = Column(Integer, default=0)
+    correct_count = Column(Integer, default=0)
+    created_at = Column(TIMESTAMP, server_default=func.now())
+
+    responses = relationship("Section3Response", back_populates="item", cascade="all, delete-orphan")
+
+
+class Section3Session(Base):
+    __tablename__ = "section3_sessions"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    application_id = Column(Integer, ForeignKey("applications.id"), nullable=False)
+    started_at = Column(TIMESTAMP, server_default=func.now())
+    completed_at = Column(TIMESTAMP, nullable=True)
+    current_theta = Column(Float, default=0.0)
+    current_se = Column(Float, nullable=True)
+    num_items_administered = Column(Integer, default=0)
+    is_active = Column(Boolean, default=True)
+    final_theta = Column(Float, nullable=True)
+    final_se = Column(Float, nullable=True)
+    final_percentile = Column(Float, nullable=True)
+    num_correct = Column(Integer, nullable=True)
+    accuracy = Column(Float, nullable=True)
+    face_violations = Column(Integer, default=0)
+    tab_violations = Column(Integer, default=0)
+
+    application = relationship("Application", back_populates="section3_sessions")
+    responses = relationship("Section3Response", back_populates="session", cascade="all, delete-orphan")
+
+
+class Section3Response(Base):
+    __tablename__ = "section3_responses"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    session_id = Column(Integer, ForeignKey("section3_sessions.id"), nullable=False)
+    item_id = Column(Integer, ForeignKey("section3_items.id"), nullable=False)
+    selected_option = Column(String(1), nullable=False)
+    is_correct = Column(Boolean, nullable=False)
+    response_time_seconds = Column(Integer, nullable=True)
+    theta_before = Column(Float, nullable=False)
+    theta_after = Column(Float, nullable=False)
+    se_after = Column(Float, nullable=False)
+    responded_at = Column(TIMESTAMP, server_default=func.now())
+
+    session = relationship("Section3Session", back_populates="responses")
+    item = relationship("Section3Item", back_populates="responses")
+
+
+# ============================================================
+# JOB AGGREGATE MAINTENANCE
+# ============================================================
+
+
+def _refresh_job_aggregates(connection, job_id):
+    """Recompute the denormalized applicant aggregates for one job"""
+    apps = Application.__table__
+    jobs = Job.__table__
+    count, top, avg = connection.execute(
+        select(
+            func.count(apps.c.id),
+            func.max(apps.c.resume_score),
+            func.avg(apps.c.resume_score),
+        ).where(apps.c.job_id == job_id)
+    ).one()
+    connection.execute(
+        jobs.update()
+        .where(jobs.c.id == job_id)
+        .values(
+            applications_count=count,
+            top_resume_score=float(top) if top is not None else None,
+            avg_resume_score=float(avg) if avg is not None else None,
+        )
+    )
+
+
+@event.listens_for(Application, "after_insert")
+@event.listens_for(Application, "after_update")
+@event.listens_for(Application, "after_delete")
+def _sync_job_aggregates(mapper, connection, target):
+    if target.job_id is not None:
+        _refresh_job_aggregates(connection, target.job_id)
@@ -0,0 +1,103 @@
+# email_templates.py
+
+"""
+Precompiled email bodies for EmailService.
+
+The templates are parsed once at import by string.Template, so each send
+is a dict-lookup substitution instead of rebuilding a multi-KB f-string.
+Candidate-supplied values must be escaped with html.escape before
+substitution into the HTML variants.
+"""
+
+from string import Template
+
+EXAM_INVITE_HTML = Template("""\
+<html>
+  <body style="font-family: 'Segoe UI', Arial, sans-serif; color: #2c3e50; line-height: 1.7; max-width: 650px; margin: 0 auto; background-color: #f5f7fa; padding: 20px;">
+    <div style="background: white; border-radius: 8px; padding: 40px; box-shadow: 0 2px 8px rgba(0,0,0,0.1);">
+      <div style="text-align: center; margin-bottom: 30px; border-bottom: 3px solid #3498db; padding-bottom: 20px;">
+        <h1 style="color: #3498db; margin: 0; font-size: 28px;">$brand</h1>
+        <p style="color: #7f8c8d; margin: 5px 0 0 0;">First Round Exam Invitation</p>
+      </div>
+      <h2 style="color: #2c3e50; font-size: 22px;">Hello $candidate_name,</h2>
+      <p style="font-size: 16px; margin: 0 0 20px 0;">
+        Thank you for applying to <strong>$job_title</strong>. You're invited to our <strong>First Round Exam</strong>!
+      </p>
+      <div style="background: linear-gradient(135deg, #3498db 0%, #2980b9 100%); color: white; padding: 25px; border-radius: 8px; margin: 25px 0;">
+        <h3 style="margin-top: 0; font-size: 18px;">📋 Exam Details</h3>
+        <ul style="list-style: none; padding: 0; margin: 0;">
+          <li style="margin: 10px 0;"><strong>🔗 Platform:</strong> <a href="$url" style="color: #ecf0f1; text-decoration: underline;">$url</a></li>
+          <li style="margin: 10px 0;"><strong>⏱️ Duration:</strong> 90 minutes</li>
+          <li style="margin: 10px 0;"><strong>💻 Format:</strong> Online MCQ + Technical Questions</li>
+        </ul>
+      </div>
+                        <div style="margin: 25px 0;">
+                            <h3 style="color: #2c3e50; font-size: 16px; margin-top: 0;">🔐 Your Access Key</h3>
+                            <div style="background: #ecf0f1; padding: 12px; border-radius: 6px; font-family: 'Courier New', monospace; font-size: 18px; text-align: center;"><strong>$exam_key</strong></div>
+        <p style="font-size: 12px; color: #e74c3c;">⚠️ Keep these credentials confidential. Do not share them with anyone.</p>
+      </div>
+      <div style="background: #ecf0f1; padding: 20px; border-left: 4px solid #3498db; border-radius: 4px; margin: 20px 0;">
+        <h3 style="color: #2c3e50; margin-top: 0;">📝 Important Instructions</h3>
+        <ol style="margin: 0; padding-left: 20px;">
+          <li>Log in 10 minutes before the exam starts.</li>
+          <li>Use a laptop/desktop with a stable internet connection.</li>
+          <li>Ensure good lighting and a quiet environment.</li>
+          <li>Have a valid photo ID ready for verification.</li>
+          <li>This is a proctored exam. Any malpractice will lead to disqualification.</li>
+        </ol>
+      </div>
+      <div style="text-align: center; margin: 30px 0;">
+        <a href="$url" style="display: inline-block; background: #3498db; color: white; padding: 14px 32px; text-decoration: none; border-radius: 6px; font-weight: bold; font-size: 16px;">Open Exam Portal</a>
+      </div>
+      <p style="font-size: 15px; color: #2c3e50; margin: 20px 0 0 0;">
+        We wish you the very best! If you have any questions, feel free to reach out.
+      </p>
+      <p style="font-size: 15px; color: #2c3e50; margin: 0;">Best regards,</p>
+      <hr style="border: 0; border-top: 2px solid #ecf0f1; margin: 30px 0;">
+      <div style="font-size: 13px; color: #7f8c8d; text-align: center;">
+        <p style="margin: 8px 0;"><strong>$brand</strong></p>
+        <p style="margin: 4px 0;">Talent Acquisition Team</p>
+        <p style="margin: 4px 0;"><a href="mailto:$from_email" style="color: #3498db; text-decoration: none;">$from_email</a></p>
+        <p style="margin: 4px 0;">© 2025 $brand. All rights reserved.</p>
+      </div>
+    </div>
+  </body>
+</html>
+""")
+
+EXAM_INVITE_TEXT = Template("""\
+Hello $candidate_name,
+Thank you for applying to $job_title. You're invited to our First Round Exam!
+Exam Details:
+Platform: $url
+Duration: 90 minutes
+Format: Online MCQ + Technical Questions
+Your Access Key:
+Access Key: $exam_key
+Important: Keep these credentials confidential. Do not share them with anyone.
+Instructions:
+1. Log in 10 minutes before the exam starts.
+2. Use a laptop/desktop with a stable internet.
+3. Ensure good lighting and quiet environment.
+4. Have a valid photo ID ready for verification.
+5. This is a proctored exam. Any malpractice leads to disqualification.
+We wish you the very best!
+Best regards,
+$brand
+""")
+
+STATUS_UPDATE_HTML = Template("""\
+<html><body style="font-family: Arial; padding: 20px; background: #f9f9f9;">
+<div style="max-width: 600px; margin: auto; background: white; padding: 30px; border-radius: 10px; box-shadow: 0 4px 12px rgba(0,0,0,0.1);">
+    <h2 style="color: #2c3e50;">Application Update</h2>
+    <p>Hello <strong>$candidate_name</strong>,</p>
+    <p>Your application for <strong>$job_title</strong> has been updated to:</p>
+    <div style="background: #e3f2fd; padding: 15px; border-radius: 8px; text-align: center; font-size: 18px; font-weight: bold; color: #1976d2;">
+    $status_label
+    </div>
+    <p style="margin-top: 20px;">$message</p>
+    <hr style="margin: 30px 0;">
+    <p style="color: #7f8c8d; font-size: 12px;">© 2025 $brand. All rights reserved.</p>
+</div>
+</body></html>
+""")
@@ -0,0 +1,83 @@
+# email_worker.py
+
+"""
+Background SMTP delivery queue.
+
+Endpoints enqueue fully built MIME messages and return immediately; a
+single worker task drains the queue in batches over one long-lived
+SMTP_SSL connection, so the TLS handshake + LOGIN cost is paid once per
+batch instead of once per email. The connection is closed after 60 idle
+seconds and reopened on the next message.
+"""
+
+import asyncio
+import logging
+import smtplib
+
+logger = logging.getLogger(__name__)
+
+IDLE_TIMEOUT = 60   # seconds without messages before closing the connection
+MAX_BATCH = 50      # messages drained per wake-up
+
+_queue = None
+_loop = None
+
+
+def start(host: str, port: int, user: str, password: str) -> None:
+    """Create the queue and the worker task; call from a startup event"""
+    global _queue, _loop
+    _loop = asyncio.get_running_loop()
+    _queue = asyncio.Queue()
+    _loop.create_task(_worker(host, port, user, password))
+    logger.info("Email worker started")
+
+
+def enqueue(msg) -> bool:
+    """
+    Queue a message for delivery. Thread-safe (endpoints run in the
+    threadpool). Returns False when the worker isn't running so callers
+    can fall back to a direct send.
+    """
+    if _queue is None or _loop is None:
+        return False
+    _loop.call_soon_threadsafe(_queue.put_nowait, msg)
+    return True
+
+
+async def _worker(host, port, user, password):
+    state = {"server": None}
+    while True:
+        try:
+            msg = await asyncio.wait_for(_queue.get(), timeout=IDLE_TIMEOUT)
+        except asyncio.TimeoutError:
+            if state["server"] is not None:
+                await asyncio.to_thread(_close, state)
+            continue
+
+        batch = [msg]
+        while not _queue.empty() and len(batch) < MAX_BATCH:
+            batch.append(_queue.get_nowait())
+
+        await asyncio.to_thread(_send_batch, state, batch, host, port, user, password)
+
+
+def _send_batch(state, batch, host, port, user, password):
+    for msg in batch:
+        try:
+            if state["server"] is None:
+                state["server"] = smtplib.SMTP_SSL(host, port)
+                state["server"].login(user, password)
+            state["server"].send_message(msg)
+            logger.info("Queued email sent to %s", msg["To"])
+        except Exception as e:
+            logger.warning("Queued email to %s failed: %s", msg["To"], e)
+            _close(state)
+
+
+def _close(state):
+    try:
+        if state["server"] is not None:
+            state["server"].quit()
+    except Exception:
+        pass
+    state["server"] = None
@@ -1,16 +1,20 @@
 from database_models import Base
 from database import engine
 from sqlalchemy import text
+import logging
+
+logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+logger = logging.getLogger(__name__)
 
 with engine.begin() as conn:
     for tbl in ['section1_sessions', 'section2_sessions', 'section3_sessions']:
         try:
             conn.execute(text(f"ALTER TABLE {tbl} ADD COLUMN face_violations INTEGER DEFAULT 0;"))
-            print(f"Added face_violations to {tbl}")
+            logger.info("Added face_violations to %s", tbl)
         except Exception as e:
-            print(e)
+            logger.warning("%s", e)
         try:
             conn.execute(text(f"ALTER TABLE {tbl} ADD COLUMN tab_violations INTEGER DEFAULT 0;"))
-            print(f"Added tab_violations to {tbl}")
+            logger.info("Added tab_violations to %s", tbl)
         except Exception as e:
-            print(e)
+            logger.warning("%s", e)
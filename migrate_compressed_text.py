@@ -0,0 +1,37 @@
+from database import engine
+from sqlalchemy import text
+
+# One-off: convert the CompressedText columns on an existing Postgres
+# database from text to bytea. The type decorator binds zlib-compressed
+# bytes on every write, which Postgres rejects against a text column;
+# fresh databases get bytea from create_all. Existing rows are kept as
+# their UTF-8 bytes — the decorator's read path detects and returns
+# legacy uncompressed values as-is.
+COLUMNS = [
+    ("applications", "key_responsibilities"),
+    ("applications", "achievements"),
+    ("applications", "cover_letter"),
+    ("video_responses", "ai_feedback"),
+]
+
+if engine.dialect.name != "postgresql":
+    print(f"Dialect is {engine.dialect.name}, bytea migration only applies to PostgreSQL")
+else:
+    for table, col in COLUMNS:
+        # Own transaction per column so one failure can't abort the rest
+        with engine.begin() as conn:
+            current = conn.execute(text(
+                "SELECT data_type FROM information_schema.columns"
+                " WHERE table_name = :t AND column_name = :c"
+            ), {"t": table, "c": col}).scalar()
+            if current == "bytea":
+                print(f"Skipped {table}.{col} (already bytea)")
+                continue
+            try:
+                conn.execute(text(
+                    f"ALTER TABLE {table} ALTER COLUMN {col} TYPE bytea"
+                    f" USING convert_to({col}, 'UTF8');"
+                ))
+                print(f"Converted {table}.{col} to bytea")
+            except Exception as e:
+                print(e)
@@ -0,0 +1,50 @@
+from database import engine
+from sqlalchemy import text
+
+# One-off: materialize the HR dashboard aggregates (Postgres only).
+# main.py refreshes it on a 60s cadence and serves dashboard reads from
+# the single precomputed row; without the view the endpoint falls back
+# to live aggregation.
+CREATE_MV = """
+CREATE MATERIALIZED VIEW IF NOT EXISTS hr_dashboard_mv AS
+SELECT
+    1 AS id,
+    (SELECT COUNT(*) FROM jobs) AS total_jobs,
+    (SELECT COUNT(*) FROM jobs WHERE status = 'open') AS open_jobs,
+    (SELECT COUNT(*) FROM jobs WHERE status = 'closed') AS closed_jobs,
+    (SELECT COUNT(*) FROM jobs WHERE status = 'draft') AS draft_jobs,
+    (SELECT COUNT(*) FROM applications) AS total_applications,
+    (SELECT COUNT(*) FROM applications
+      WHERE applied_at >= CURRENT_DATE
+        AND applied_at < CURRENT_DATE + 1) AS applications_today,
+    (SELECT COUNT(*) FROM applications
+      WHERE applied_at >= CURRENT_DATE - 7) AS applications_this_week,
+    (SELECT COUNT(*) FROM applications
+      WHERE applied_at >= CURRENT_DATE - 30) AS applications_this_month,
+    (SELECT AVG(resume_score) FROM applications) AS avg_resume_score,
+    (SELECT AVG(cat_theta) FROM applications) AS avg_cat_theta,
+    (SELECT AVG(cat_percentile) FROM applications) AS avg_cat_percentile,
+    (SELECT COALESCE(jsonb_object_agg(stage, cnt), '{}'::jsonb)
+       FROM (SELECT current_stage::text AS stage, COUNT(*) AS cnt
+               FROM applications GROUP BY current_stage) s) AS stages,
+    (SELECT COALESCE(jsonb_agg(kw), '[]'::jsonb)
+       FROM (SELECT kw
+               FROM applications, jsonb_array_elements_text(resume_keywords) AS kw
+              WHERE resume_keywords IS NOT NULL
+              GROUP BY kw ORDER BY COUNT(*) DESC LIMIT 10) k) AS top_keywords,
+    (SELECT COALESCE(jsonb_agg(
+                jsonb_build_object('job_id', id, 'job_title', title, 'count', applications_count)),
+            '[]'::jsonb)
+       FROM jobs WHERE applications_count > 0) AS applications_by_job;
+"""
+
+# REFRESH ... CONCURRENTLY requires a unique index on the view
+CREATE_INDEX = "CREATE UNIQUE INDEX IF NOT EXISTS ix_hr_dashboard_mv_id ON hr_dashboard_mv (id);"
+
+with engine.begin() as conn:
+    if conn.dialect.name != "postgresql":
+        print("hr_dashboard_mv requires Postgres; nothing to do")
+    else:
+        conn.execute(text(CREATE_MV))
+        conn.execute(text(CREATE_INDEX))
+        print("OK: hr_dashboard_mv")
@@ -0,0 +1,46 @@
+from database import engine
+from sqlalchemy import text
+
+# One-off: create the hot-path filter indexes on an existing database.
+# Fresh databases get them from Base.metadata.create_all. Each statement
+# runs in its own transaction — on Postgres a single failure would
+# otherwise abort the transaction and silently skip everything after it
+# on rerun.
+STATEMENTS = [
+    "CREATE INDEX IF NOT EXISTS ix_job_status_posted ON jobs (status, posted_at DESC);",
+    "CREATE INDEX IF NOT EXISTS ix_app_job_stage_score"
+    " ON applications (job_id, current_stage, resume_score DESC);",
+    "CREATE INDEX IF NOT EXISTS ix_app_candidate_time"
+    " ON applications (candidate_id, applied_at DESC);",
+    "CREATE INDEX IF NOT EXISTS ix_app_stage_pending ON applications (current_stage)"
+    " WHERE current_stage IN ('aptitude', 'video_hr');",
+    "CREATE INDEX IF NOT EXISTS ix_vr_application_question"
+    " ON video_responses (application_id, job_video_question_id);",
+    "CREATE INDEX IF NOT EXISTS ix_cir_session_time"
+    " ON cat_item_responses (session_id, responded_at);",
+    "CREATE UNIQUE INDEX IF NOT EXISTS ix_app_cat_key ON applications (cat_exam_key)"
+    " WHERE cat_exam_key IS NOT NULL;",
+    "CREATE UNIQUE INDEX IF NOT EXISTS ix_app_hr_key ON applications (hr_video_exam_key)"
+    " WHERE hr_video_exam_key IS NOT NULL;",
+    "CREATE INDEX IF NOT EXISTS ix_cat_sessions_finished ON cat_sessions (id)"
+    " WHERE is_active = false;",
+    "CREATE UNIQUE INDEX IF NOT EXISTS uq_job_video_question"
+    " ON job_video_questions (job_id, video_question_id);",
+    # DROP IF EXISTS first so the ADD CONSTRAINT reruns cleanly
+    "ALTER TABLE video_responses DROP CONSTRAINT IF EXISTS ck_vr_hr_score_range;",
+    "ALTER TABLE video_responses ADD CONSTRAINT ck_vr_hr_score_range"
+    " CHECK (hr_score IS NULL OR (hr_score >= 0 AND hr_score <= 10));",
+    "CREATE INDEX IF NOT EXISTS ix_app_applied_at ON applications (applied_at);",
+    "CREATE INDEX IF NOT EXISTS ix_catitemresp_session_item"
+    " ON cat_item_responses (session_id, item_id)"
+    " INCLUDE (selected_option, is_correct, theta_before, theta_after, se_after);",
+]
+
+with engine.connect() as conn:
+    for stmt in STATEMENTS:
+        try:
+            with conn.begin():
+                conn.execute(text(stmt))
+            print(f"OK: {stmt.split(' CHECK ')[0].split(' ON ')[0]}")
+        except Exception as e:
+            print(e)
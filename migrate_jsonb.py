@@ -0,0 +1,23 @@
+from database import engine
+from sqlalchemy import text
+
+JSONB_COLUMNS = [
+    'previous_companies', 'technical_skills', 'soft_skills', 'certifications',
+    'projects', 'project_technologies', 'resume_parsed_skills', 'resume_keywords',
+]
+
+with engine.begin() as conn:
+    if engine.dialect.name != 'postgresql':
+        print(f"Dialect is {engine.dialect.name}, JSONB migration only applies to PostgreSQL")
+    else:
+        for col in JSONB_COLUMNS:
+            try:
+                conn.execute(text(f"ALTER TABLE applications ALTER COLUMN {col} TYPE jsonb USING {col}::jsonb;"))
+                print(f"Converted applications.{col} to jsonb")
+            except Exception as e:
+                print(e)
+        try:
+            conn.execute(text("CREATE INDEX IF NOT EXISTS ix_app_tskills_gin ON applications USING gin (technical_skills);"))
+            print("Created ix_app_tskills_gin")
+        except Exception as e:
+            print(e)
@@ -340,6 +340,14 @@ class StatusUpdateRequest(ORMModel):
     custom_message: Optional[str] = None
 
 
+class BulkStatusUpdateRequest(ORMModel):
+    """Set many applications to one stage with a single UPDATE"""
+    ids: List[int]
+    status: str
+    send_email: bool = True
+    message: Optional[str] = None
+
+
 # ============================================================
 # CAT Exam Schemas
 # ============================================================
@@ -0,0 +1,52 @@
+# response_cache.py
+
+"""
+In-process TTL cache for hot list endpoints.
+
+The public job board and the HR dashboard poll /jobs and /cat-items with
+the same query parameters on every refresh, re-running identical
+filtered+ordered queries. This memoizes the loaded rows per parameter
+combination for a short TTL so repeats are a dict lookup instead of a
+round-trip to the database. The design brief called for Redis; with no
+Redis in the deployment this uses the same in-process approach as the
+CAT state cache, with versioned namespaces standing in for Redis-style
+`DEL jobs:*` invalidation — writers bump the namespace version and all
+older keys go stale at once.
+"""
+
+import time
+
+_entries = {}
+_versions = {}
+
+
+def get(namespace: str, key: tuple):
+    """Return the cached payload, or None if absent/expired/invalidated"""
+    entry = _entries.get((namespace, _versions.get(namespace, 0), key))
+    if entry is None:
+        return None
+    payload, expires = entry
+    if expires < time.monotonic():
+        return None
+    return payload
+
+
+def put(namespace: str, key: tuple, payload, ttl: float) -> None:
+    """Cache a payload under the namespace's current version"""
+    _prune()
+    _entries[(namespace, _versions.get(namespace, 0), key)] = (
+        payload,
+        time.monotonic() + ttl,
+    )
+
+
+def invalidate(namespace: str) -> None:
+    """Drop every key in the namespace by bumping its version"""
+    _versions[namespace] = _versions.get(namespace, 0) + 1
+
+
+def _prune() -> None:
+    now = time.monotonic()
+    stale = [k for k, (_, expires) in _entries.items() if expires < now]
+    for k in stale:
+        del _entries[k]
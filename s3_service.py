@@ -2,9 +2,19 @@
 import os
 import mimetypes
 import boto3
+from boto3.s3.transfer import TransferConfig
 from datetime import datetime
 from fastapi import UploadFile, HTTPException
 
+# Stream uploads in 8 MB multipart chunks so a large video never sits
+# fully in RAM; parts above the threshold upload on 4 threads
+_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 << 20,
+    multipart_chunksize=8 << 20,
+    max_concurrency=4,
+    use_threads=True,
+)
+
 
 class S3Service:
     def __init__(self):
@@ -39,18 +49,19 @@ class S3Service:
         key = f"uploads/{timestamp}_{safe_filename}"
 
         try:
-            file_content = await file.read()
-
             # Detect content-type safely
             guessed_type, _ = mimetypes.guess_type(file.filename)
             content_type = file.content_type or guessed_type or "application/octet-stream"
 
-            # Upload to S3
-            self.s3_client.put_object(
-                Bucket=self.bucket,
-                Key=key,
-                Body=file_content,
-                ContentType=content_type
+            # Stream the SpooledTemporaryFile straight to S3 instead of
+            # buffering the whole upload with file.read()
+            await file.seek(0)
+            self.s3_client.upload_fileobj(
+                file.file,
+                self.bucket,
+                key,
+                ExtraArgs={"ContentType": content_type},
+                Config=_TRANSFER_CONFIG
             )
 
             return {"key": key, "filename": file.filename}
@@ -0,0 +1,68 @@
+# scoring_cache.py
+
+"""
+Content-addressed cache for resume/JD scoring results.
+
+Keys are built from hashes of the resume text and the job description, so
+any edit to either side naturally produces a fresh key. Lookups hit an
+in-process LRU first and fall back to the scoring_cache table, which lets
+a re-score after a JD edit reuse results across workers and restarts
+instead of repeating one Gemini call per application.
+"""
+
+from __future__ import annotations
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Optional
+
+import database_models
+
+logger = logging.getLogger(__name__)
+
+_MEM_MAX = 4096
+_mem: "OrderedDict[str, dict]" = OrderedDict()
+
+
+def make_key(resume_text: str, jd_text: str) -> str:
+    """Cache key from the two content hashes"""
+    rh = hashlib.sha256((resume_text or "").encode()).hexdigest()[:16]
+    jh = hashlib.sha256((jd_text or "").encode()).hexdigest()[:16]
+    return f"{rh}:{jh}"
+
+
+def get(key: str, db=None) -> Optional[dict]:
+    """Look the key up in memory, then in the scoring_cache table"""
+    payload = _mem.get(key)
+    if payload is not None:
+        _mem.move_to_end(key)
+        return payload
+
+    if db is not None:
+        row = db.query(database_models.ScoringCache).filter(
+            database_models.ScoringCache.key == key
+        ).first()
+        if row is not None:
+            _remember(key, row.payload)
+            return row.payload
+    return None
+
+
+def put(key: str, payload: dict, db=None) -> None:
+    """Store a scoring result in memory and, when possible, the table"""
+    _remember(key, payload)
+
+    if db is not None:
+        try:
+            db.merge(database_models.ScoringCache(key=key, payload=payload))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.warning("Scoring cache write failed: %s", e)
+
+
+def _remember(key: str, payload: dict) -> None:
+    _mem[key] = payload
+    _mem.move_to_end(key)
+    while len(_mem) > _MEM_MAX:
+        _mem.popitem(last=False)